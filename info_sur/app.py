@@ -1,17 +1,30 @@
 """Main Flask application for Info Sur."""
 from __future__ import annotations
 
+import gzip
 import logging
 import os
 from pathlib import Path
-from typing import Any, Dict
-
-from flask import Flask, Response, jsonify, redirect, render_template, request, send_from_directory
+from typing import Any, Dict, Optional
+
+import click
+from flask import (
+    Flask,
+    Response,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    send_from_directory,
+    stream_with_context,
+)
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from werkzeug.exceptions import BadRequest, NotFound
 
-from .database import Base, engine
+from .archive import ARCHIVE_AFTER_DAYS, archive_articles, compact_hot_store, restore_article
+from .database import ArchiveBase, Base, archive_engine, dispose_engines, engine
+from .models import create_slug_index
 from .services import (
     ARTICLE_FIELDS,
     create_article_record,
@@ -22,9 +35,11 @@ from .services import (
     get_template_html,
     list_articles,
     render_article_html,
+    render_preview_html,
     save_template_html,
     update_article,
 )
+from .transfer import CONFLICT_MODES, import_ndjson, iter_export_chunks, open_ndjson
 
 # Configure logging
 logging.basicConfig(
@@ -36,12 +51,18 @@ logger = logging.getLogger(__name__)
 
 def create_app() -> Flask:
     Base.metadata.create_all(engine)
+    create_slug_index(engine)
+    ArchiveBase.metadata.create_all(archive_engine)
+    # Don't hand pooled connections over to forked gunicorn workers (--preload)
+    dispose_engines()
 
     app = Flask(
         __name__,
         static_folder=str(Path(__file__).parent / "static"),
         template_folder=str(Path(__file__).parent / "templates"),
     )
+    # FLASK_* environment variables, e.g. FLASK_RATELIMIT_ENABLED=false for load tests
+    app.config.from_prefixed_env()
 
     # Configure rate limiting
     limiter = Limiter(
@@ -50,6 +71,9 @@ def create_app() -> Flask:
         default_limits=["200 per day", "50 per hour"],
         storage_uri="memory://",
     )
+    # When disabled the limiter does not register itself on the app, but the
+    # decorated views only keep a weak reference to it.
+    app.extensions.setdefault("limiter", set()).add(limiter)
 
     logger.info("Info Sur application initialized")
 
@@ -171,6 +195,142 @@ def create_app() -> Flask:
         save_template_html(html)
         return jsonify({"status": "saved"})
 
+    @app.route("/api/preview", methods=["POST"])
+    # Called on every keystroke (debounced) by the editor, so far above the defaults
+    @limiter.limit("600 per minute", override_defaults=True)
+    def api_preview():
+        data = request.get_json(force=True)
+        if not isinstance(data, dict):
+            raise BadRequest("Se esperaba un objeto JSON")
+        for key in ("article_data", "image_data"):
+            if data.get(key) is not None and not isinstance(data[key], dict):
+                raise BadRequest(f"{key} debe ser un objeto")
+        if "temas" in data and not isinstance(data["temas"], list):
+            raise BadRequest("temas debe ser una lista")
+        template_html = data.get("template")
+        if template_html is not None and not isinstance(template_html, str):
+            raise BadRequest("El template debe ser texto")
+
+        article_data = dict(data.get("article_data") or {})
+        if "temas" in data:
+            article_data["temas"] = data["temas"]
+        html = render_preview_html(article_data, data.get("image_data") or {}, template_html)
+        # Client-supplied HTML on our origin: only safe inside the sandboxed iframe
+        return Response(
+            html,
+            mimetype="text/html",
+            headers={"Content-Security-Policy": "sandbox allow-scripts"},
+        )
+
+    @app.route("/api/export", methods=["GET"])
+    def api_export():
+        compress = request.args.get("gzip", "0").lower() in {"1", "true", "yes"}
+        include_templates = request.args.get("templates", "1").lower() not in {"0", "false", "no"}
+        include_archive = request.args.get("archive", "1").lower() not in {"0", "false", "no"}
+        filename = "articles.ndjson.gz" if compress else "articles.ndjson"
+        body = stream_with_context(
+            iter_export_chunks(
+                compress=compress,
+                include_templates=include_templates,
+                include_archive=include_archive,
+            )
+        )
+        return Response(
+            body,
+            mimetype="application/gzip" if compress else "application/x-ndjson",
+            headers={"Content-Disposition": f"attachment; filename={filename}"},
+        )
+
+    @app.route("/api/import", methods=["POST"])
+    def api_import():
+        on_conflict = request.args.get("on_conflict", "skip")
+        if on_conflict not in CONFLICT_MODES:
+            raise BadRequest(f"on_conflict debe ser uno de {', '.join(CONFLICT_MODES)}")
+        stream = request.stream
+        if request.content_encoding == "gzip" or request.mimetype == "application/gzip":
+            stream = gzip.GzipFile(fileobj=stream)
+        try:
+            stats = import_ndjson(stream, on_conflict=on_conflict)
+        except (ValueError, OSError) as exc:
+            logger.error(f"Failed to import articles: {exc}")
+            raise BadRequest(str(exc)) from exc
+        logger.info(f"Imported articles: {stats}")
+        return jsonify(stats)
+
+    @app.cli.command("export-articles")
+    @click.option("-o", "--output", default="-", help="Fichero de salida (.gz para comprimir).")
+    @click.option("--gzip/--no-gzip", "compress", default=None, help="Forzar compresión gzip.")
+    @click.option("--templates/--no-templates", default=True, help="Incluir revisiones del template.")
+    @click.option("--archive/--no-archive", default=True, help="Incluir artículos archivados.")
+    def export_articles_command(output: str, compress: bool, templates: bool, archive: bool) -> None:
+        """Export articles and template revisions as NDJSON."""
+        if output == "-":
+            target = click.get_binary_stream("stdout")
+            chunks = iter_export_chunks(bool(compress), include_templates=templates, include_archive=archive)
+            for chunk in chunks:
+                target.write(chunk)
+            target.flush()
+            return
+        if compress is None:
+            compress = output.endswith(".gz")
+        with open(output, "wb") as target:
+            chunks = iter_export_chunks(compress, include_templates=templates, include_archive=archive)
+            for chunk in chunks:
+                target.write(chunk)
+        click.echo(f"Exportación guardada en {output}", err=True)
+
+    @app.cli.command("import-articles")
+    @click.argument("source")
+    @click.option(
+        "--on-conflict",
+        type=click.Choice(CONFLICT_MODES),
+        default="skip",
+        show_default=True,
+        help="Qué hacer con los slugs existentes.",
+    )
+    def import_articles_command(source: str, on_conflict: str) -> None:
+        """Import articles from an NDJSON file (use - for stdin)."""
+        try:
+            if source == "-":
+                stats = import_ndjson(click.get_binary_stream("stdin"), on_conflict=on_conflict)
+            else:
+                with open_ndjson(source, "rb") as stream:
+                    stats = import_ndjson(stream, on_conflict=on_conflict)
+        except (ValueError, OSError) as exc:
+            raise click.ClickException(str(exc)) from exc
+        click.echo(
+            f"Importados {stats['inserted']} artículos, actualizados {stats['updated']}, "
+            f"omitidos {stats['skipped']}, templates {stats['templates']}"
+        )
+
+    @app.cli.command("archive-articles")
+    @click.option(
+        "--older-than-days",
+        type=click.IntRange(min=0),
+        default=None,
+        help=f"Edad mínima en días (por defecto ARCHIVE_AFTER_DAYS={ARCHIVE_AFTER_DAYS}).",
+    )
+    @click.option("--vacuum/--no-vacuum", default=True, help="Compactar la base principal al terminar.")
+    def archive_articles_command(older_than_days: Optional[int], vacuum: bool) -> None:
+        """Move articles not created or modified recently into the archive store."""
+        moved = archive_articles(older_than_days)
+        if moved and vacuum:
+            compact_hot_store()
+        logger.info(f"Archived {moved} articles")
+        click.echo(f"Archivados {moved} artículos")
+
+    @app.cli.command("restore-article")
+    @click.argument("slug")
+    def restore_article_command(slug: str) -> None:
+        """Move an archived article back into the hot table."""
+        try:
+            restored = restore_article(slug)
+        except ValueError as exc:
+            raise click.ClickException(str(exc)) from exc
+        if not restored:
+            raise click.ClickException(f"No hay ningún artículo archivado con slug {slug}")
+        click.echo(f"Artículo {slug} restaurado")
+
     @app.route("/<path:slug_timestamp>")
     def serve_article(slug_timestamp: str):
         if slug_timestamp.startswith("api/") or slug_timestamp == "editor":
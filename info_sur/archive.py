@@ -0,0 +1,197 @@
+"""Hot/cold tiering: move old articles into a compressed archive store."""
+from __future__ import annotations
+
+import json
+import os
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, Optional, Set
+
+from sqlalchemy import delete, insert, select, tuple_
+
+from .database import engine, get_archive_session, get_session
+from .models import Article, ArchivedArticle, utc_now
+
+ARCHIVE_AFTER_DAYS = int(os.environ.get("ARCHIVE_AFTER_DAYS", 365))
+ARCHIVE_BATCH_SIZE = 500
+PAYLOAD_COLUMNS = (
+    "prompt",
+    "satire_level",
+    "image_prompt_primary",
+    "image_prompt_secondary",
+    "article_data",
+    "image_data",
+    "updated_at",
+)
+
+
+def pack_article(article: Article) -> bytes:
+    """Serialize the columns not indexed by the archive into a zlib blob."""
+    payload: Dict[str, Any] = {column: getattr(article, column) for column in PAYLOAD_COLUMNS}
+    if payload["updated_at"]:
+        payload["updated_at"] = payload["updated_at"].isoformat()
+    payload["article_data"] = dict(payload["article_data"] or {})
+    payload["image_data"] = dict(payload["image_data"] or {})
+    return zlib.compress(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def unpack_article(archived: ArchivedArticle) -> Article:
+    """Rebuild a detached :class:`Article` from its archived form."""
+    payload = json.loads(zlib.decompress(archived.payload))
+    if payload.get("updated_at"):
+        payload["updated_at"] = datetime.fromisoformat(payload["updated_at"])
+    return Article(
+        id=archived.article_id,
+        slug=archived.slug,
+        timestamp=archived.timestamp,
+        created_at=archived.created_at,
+        **payload,
+    )
+
+
+def get_archived_article(slug: str) -> Optional[Article]:
+    with get_archive_session() as session:
+        archived = session.query(ArchivedArticle).filter(ArchivedArticle.slug == slug).one_or_none()
+        if not archived:
+            return None
+        return unpack_article(archived)
+
+
+def iter_archived_articles(batch_size: int = ARCHIVE_BATCH_SIZE) -> Iterator[Article]:
+    """Stream every archived article, oldest first."""
+    with get_archive_session() as session:
+        rows = session.scalars(
+            select(ArchivedArticle)
+            .order_by(ArchivedArticle.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for archived in rows:
+            yield unpack_article(archived)
+
+
+def archive_cutoff(older_than_days: Optional[int] = None) -> datetime:
+    days = ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    # created_at is stored as naive UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+
+
+def archive_articles(older_than_days: Optional[int] = None, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """Move articles created and last modified before the cutoff to the archive.
+
+    Articles edited (or restored) recently stay hot. Each batch is committed
+    to the archive before it is deleted from the hot table, so an interrupted
+    run never loses articles; re-running replaces any archived copy left behind.
+    A row is only deleted if its ``updated_at`` still matches the packed copy;
+    articles edited mid-run stay hot and their archived copy is dropped.
+    """
+    cutoff = archive_cutoff(older_than_days)
+    moved = 0
+    last_id = 0
+    while True:
+        with get_session() as session:
+            articles = (
+                session.query(Article)
+                .filter(Article.created_at < cutoff, Article.updated_at < cutoff, Article.id > last_id)
+                .order_by(Article.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not articles:
+                break
+            last_id = articles[-1].id
+            rows: Dict[str, Dict[str, Any]] = {}
+            versions: Dict[int, datetime] = {}
+            for article in articles:
+                if article.slug in rows:
+                    # Duplicate slug: archive one copy, leave the rest hot
+                    continue
+                rows[article.slug] = {
+                    "article_id": article.id,
+                    "slug": article.slug,
+                    "timestamp": article.timestamp,
+                    "created_at": article.created_at,
+                    "payload": pack_article(article),
+                }
+                versions[article.id] = article.updated_at
+
+            with get_archive_session() as archive:
+                # Only replace copies of the same article left by an interrupted run
+                taken = dict(archive.execute(
+                    select(ArchivedArticle.slug, ArchivedArticle.article_id)
+                    .where(ArchivedArticle.slug.in_(list(rows)))
+                ).all())
+                rows = {
+                    slug: row for slug, row in rows.items()
+                    if taken.get(slug, row["article_id"]) == row["article_id"]
+                }
+                if rows:
+                    archive.execute(delete(ArchivedArticle).where(ArchivedArticle.slug.in_(list(rows))))
+                    archive.execute(insert(ArchivedArticle), list(rows.values()))
+            if not rows:
+                continue
+
+            deleted = set(session.scalars(
+                delete(Article)
+                .where(tuple_(Article.id, Article.updated_at).in_(
+                    [(row["article_id"], versions[row["article_id"]]) for row in rows.values()]
+                ))
+                .returning(Article.id),
+                execution_options={"synchronize_session": False},
+            ))
+            edited = [slug for slug, row in rows.items() if row["article_id"] not in deleted]
+            if edited:
+                with get_archive_session() as archive:
+                    archive.execute(delete(ArchivedArticle).where(ArchivedArticle.slug.in_(edited)))
+        moved += len(deleted)
+    return moved
+
+
+def restore_article(slug: str) -> bool:
+    """Move an archived article back into the hot table.
+
+    ``updated_at`` is reset so the next archiving run leaves it alone. Raises
+    ``ValueError`` if the slug is already in the hot table.
+    """
+    with get_archive_session() as archive:
+        archived = archive.query(ArchivedArticle).filter(ArchivedArticle.slug == slug).one_or_none()
+        if not archived:
+            return False
+        article = unpack_article(archived)
+        with get_session() as session:
+            if session.query(Article.id).filter(Article.slug == slug).first():
+                raise ValueError(f"El artículo {slug} ya está en la tabla principal")
+            article.id = None
+            article.updated_at = utc_now()
+            session.add(article)
+        archive.delete(archived)
+        return True
+
+
+def archived_slugs(slugs: Iterable[str]) -> Set[str]:
+    """Return which of ``slugs`` are in the archive."""
+    with get_archive_session() as session:
+        return set(session.scalars(select(ArchivedArticle.slug).where(ArchivedArticle.slug.in_(list(slugs)))))
+
+
+def replace_archived(rows: Iterable[Dict[str, Any]]) -> int:
+    """Overwrite archived articles with ``rows`` (Article column dicts)."""
+    updated = 0
+    with get_archive_session() as session:
+        for row in rows:
+            archived = session.query(ArchivedArticle).filter(ArchivedArticle.slug == row["slug"]).one()
+            # Columns missing from the row keep their archived values
+            article = unpack_article(archived)
+            for column, value in row.items():
+                setattr(article, column, value)
+            archived.timestamp = article.timestamp
+            archived.created_at = article.created_at
+            archived.payload = pack_article(article)
+            updated += 1
+    return updated
+
+
+def compact_hot_store() -> None:
+    """Reclaim the space freed in the hot database after archiving."""
+    statement = "VACUUM" if engine.dialect.name == "sqlite" else "VACUUM ANALYZE articles"
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.exec_driver_sql(statement)
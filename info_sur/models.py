@@ -4,10 +4,16 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import JSON, Column, DateTime, Integer, String, Text
+from sqlalchemy import JSON, Column, DateTime, Integer, LargeBinary, String, Text, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.mutable import MutableDict
 
-from .database import Base
+from .database import ArchiveBase, Base
+
+# JSONB on PostgreSQL, plain JSON (text) elsewhere
+JSONType = JSON().with_variant(JSONB(), "postgresql")
 
 
 def utc_now():
@@ -19,18 +25,38 @@ class Article(Base):
     __tablename__ = "articles"
 
     id: int = Column(Integer, primary_key=True)
-    slug: str = Column(String(255), nullable=False)
+    slug: str = Column(String(255), nullable=False, unique=True, index=True)
     timestamp: str = Column(String(14), nullable=False, index=True)
     prompt: str = Column(Text, nullable=False)
     satire_level: int = Column(Integer, nullable=False, default=50)
     image_prompt_primary: Optional[str] = Column(Text, nullable=True)
     image_prompt_secondary: Optional[str] = Column(Text, nullable=True)
-    article_data: Dict[str, Any] = Column(MutableDict.as_mutable(JSON), nullable=False)
-    image_data: Dict[str, Any] = Column(MutableDict.as_mutable(JSON), nullable=False, default=dict)
+    article_data: Dict[str, Any] = Column(MutableDict.as_mutable(JSONType), nullable=False)
+    image_data: Dict[str, Any] = Column(MutableDict.as_mutable(JSONType), nullable=False, default=dict)
     created_at: datetime = Column(DateTime, default=utc_now, nullable=False)
     updated_at: datetime = Column(DateTime, default=utc_now, onupdate=utc_now, nullable=False)
 
 
+def create_slug_index(bind: Engine) -> None:
+    """Add the unique slug index to ``articles`` tables created before it existed.
+
+    ``create_all`` only builds indexes along with new tables. Fails with a
+    list of the offending slugs if the table already holds duplicates.
+    """
+    index = next(index for index in Article.__table__.indexes if index.unique)
+    try:
+        index.create(bind, checkfirst=True)
+    except IntegrityError as exc:
+        with bind.connect() as connection:
+            duplicates = connection.scalars(
+                select(Article.slug).group_by(Article.slug).having(func.count() > 1).limit(10)
+            ).all()
+        raise RuntimeError(
+            f"La tabla articles tiene slugs duplicados ({', '.join(duplicates)}); "
+            "elimina los sobrantes antes de arrancar"
+        ) from exc
+
+
 class TemplateRevision(Base):
     __tablename__ = "template_revisions"
 
@@ -41,3 +67,17 @@ class TemplateRevision(Base):
     @classmethod
     def latest(cls, session) -> "TemplateRevision":
         return session.query(cls).order_by(cls.created_at.desc()).first()
+
+
+class ArchivedArticle(ArchiveBase):
+    """An article moved to the cold store; the full row is kept compressed."""
+
+    __tablename__ = "archived_articles"
+
+    id: int = Column(Integer, primary_key=True)
+    article_id: int = Column(Integer, nullable=False)
+    slug: str = Column(String(255), nullable=False, unique=True)
+    timestamp: str = Column(String(14), nullable=False)
+    created_at: datetime = Column(DateTime, nullable=False, index=True)
+    archived_at: datetime = Column(DateTime, default=utc_now, nullable=False)
+    payload: bytes = Column(LargeBinary, nullable=False)
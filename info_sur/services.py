@@ -7,32 +7,12 @@ import re
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
-from bs4 import BeautifulSoup
 from openai import OpenAI
 
+from .archive import get_archived_article
 from .database import get_session
 from .models import Article, TemplateRevision
-
-ARTICLE_FIELDS: List[str] = [
-    "mod_titulo",
-    "mod_subtitulo",
-    "mod_autores",
-    "mod_ciudad",
-    "mod_fecha",
-    "mod_pie1",
-    "mod_cuerpo1",
-    "mod_cuerpo2",
-    "mod_relacionada",
-    "mod_pie2",
-    "mod_cuerpo3",
-    "mod_cuerpo4",
-    "mod_catchline",
-    "mod_cuerpo5",
-    "mod_cuerpo6",
-    "mod_cuerpo7",
-]
-
-TAG_PREFIX = "mod_tema"
+from .rendering import ARTICLE_FIELDS, compile_template
 
 
 def slugify(value: str) -> str:
@@ -61,6 +41,11 @@ def ensure_template(session) -> TemplateRevision:
 
 
 def get_template_html() -> str:
+    with get_session(readonly=True) as session:
+        template = TemplateRevision.latest(session)
+        if template:
+            return template.template_html
+    # First run: the default template has to be stored on the primary
     with get_session() as session:
         template = ensure_template(session)
         return template.template_html
@@ -80,7 +65,8 @@ def generate_article_via_openai(prompt: str, satire_level: int, image_prompts: L
     if not api_key:
         raise RuntimeError("OPENAI_API_KEY environment variable is not set")
 
-    client = OpenAI(api_key=api_key)
+    # OPENAI_BASE_URL lets staging and load tests point at a compatible stub server
+    client = OpenAI(api_key=api_key, base_url=os.environ.get("OPENAI_BASE_URL") or None)
     satire_descriptor = (
         "totalmente sobrio y profesional" if satire_level <= 10
         else "equilibrio entre rigor y sátira" if satire_level <= 60
@@ -229,11 +215,12 @@ def create_article_record(
         session.add(article)
         session.flush()
         session.refresh(article)
+        session.expunge(article)
         return article
 
 
 def list_articles() -> List[Dict[str, Any]]:
-    with get_session() as session:
+    with get_session(readonly=True) as session:
         articles = session.query(Article).order_by(Article.created_at.desc()).all()
         return [
             {
@@ -256,11 +243,13 @@ def get_article(article_id: int) -> Optional[Article]:
 
 
 def get_article_by_slug(slug: str) -> Optional[Article]:
-    with get_session() as session:
+    with get_session(readonly=True) as session:
         article = session.query(Article).filter(Article.slug == slug).one_or_none()
         if article:
             session.expunge(article)
-        return article
+            return article
+    # Old articles live in the cold store
+    return get_archived_article(slug)
 
 
 def update_article(article_id: int, payload: Dict[str, Any]) -> Optional[Article]:
@@ -292,48 +281,15 @@ def delete_article(article_id: int) -> bool:
 
 
 def render_article_html(article: Article) -> str:
-    template_html = get_template_html()
-    soup = BeautifulSoup(template_html, "lxml")
-
-    modules = article.article_data.copy()
-    temas: List[str] = modules.get("temas", [])
-
-    for field in ARTICLE_FIELDS:
-        value = modules.get(field, "")
-        text_value = "" if value is None else str(value)
-        for tag in soup.select(f".{field}"):
-            if tag.name == "img":
-                if field == "mod_pie1" and article.image_data.get("primary"):
-                    tag["src"] = article.image_data["primary"]
-                    tag["alt"] = text_value or tag.get("alt", "")
-                elif field == "mod_pie2" and article.image_data.get("secondary"):
-                    tag["src"] = article.image_data["secondary"]
-                    tag["alt"] = text_value or tag.get("alt", "")
-                continue
-            tag.clear()
-            if text_value:
-                tag.append(text_value)
-
-    # Handle autores ensuring separators
-    for tag in soup.select(".mod_autores"):
-        autores = modules.get("mod_autores")
-        if isinstance(autores, list):
-            autores = " y ".join(autores)
-        if autores:
-            tag.clear()
-            tag.append(autores)
-
-    # Replace temas
-    tema_tags = soup.select(f"[class*={TAG_PREFIX}]")
-    for idx, tema in enumerate(temas, start=1):
-        selector = f".{TAG_PREFIX}{idx}"
-        for tag in soup.select(selector):
-            tag.clear()
-            tag.append(tema)
-    # Remove extra temas
-    for idx in range(len(temas) + 1, 10):
-        selector = f".{TAG_PREFIX}{idx}"
-        for tag in soup.select(selector):
-            tag.decompose()
-
-    return soup.prettify(formatter="html")
+    return render_preview_html(article.article_data, article.image_data)
+
+
+def render_preview_html(
+    article_data: Dict[str, Any],
+    image_data: Optional[Dict[str, Any]] = None,
+    template_html: Optional[str] = None,
+) -> str:
+    """Render unsaved article data, optionally against a candidate template."""
+    if template_html is None:
+        template_html = get_template_html()
+    return compile_template(template_html).render(article_data, image_data)
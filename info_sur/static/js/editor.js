@@ -12,8 +12,14 @@ const editOutput = document.getElementById('edit-output');
 const templateEditor = document.getElementById('template-editor');
 const templateOutput = document.getElementById('template-output');
 const saveTemplateBtn = document.getElementById('save-template');
+const editPreview = document.getElementById('edit-preview');
+const templatePreview = document.getElementById('template-preview');
+
+const PREVIEW_DEBOUNCE_MS = 250;
 
 let articlesCache = [];
+let previewTimer = null;
+let previewController = null;
 
 function switchTab(targetTab) {
     tabs.forEach((tab) => {
@@ -35,7 +41,7 @@ tabs.forEach((tab) => {
             loadArticles();
         }
         if (tab.dataset.tab === 'template') {
-            loadTemplate();
+            loadTemplate().then(() => schedulePreview(templatePreview, true));
         }
     });
 });
@@ -146,20 +152,18 @@ function populateEditor(article) {
             el.value = '';
         }
     });
+    schedulePreview(editPreview);
 }
 
-async function submitEdit(event) {
-    event.preventDefault();
+function buildEditPayload() {
     const formData = new FormData(editForm);
-    const articleId = formData.get('article_id');
-
     const articleData = {};
     for (const [key, value] of formData.entries()) {
         if (!value || key === 'article_id' || key === 'temas' || key.startsWith('image_')) continue;
         articleData[key] = value;
     }
 
-    const payload = {
+    return {
         article_data: articleData,
         temas: formData.get('temas')
             ? formData.get('temas').split(',').map((t) => t.trim()).filter(Boolean)
@@ -169,6 +173,12 @@ async function submitEdit(event) {
             secondary: formData.get('image_secondary') || null,
         },
     };
+}
+
+async function submitEdit(event) {
+    event.preventDefault();
+    const articleId = editForm.article_id.value;
+    const payload = buildEditPayload();
 
     try {
         const response = await fetch(`/api/articles/${articleId}`, {
@@ -187,6 +197,38 @@ async function submitEdit(event) {
 }
 
 editForm?.addEventListener('submit', submitEdit);
+editForm?.addEventListener('input', () => schedulePreview(editPreview));
+
+function schedulePreview(frame, withTemplate = false) {
+    clearTimeout(previewTimer);
+    previewTimer = setTimeout(() => renderPreview(frame, withTemplate), PREVIEW_DEBOUNCE_MS);
+}
+
+async function renderPreview(frame, withTemplate) {
+    // Cancel the in-flight request so a slow response never overwrites a newer one
+    previewController?.abort();
+    previewController = new AbortController();
+
+    const payload = editForm.article_id.value ? buildEditPayload() : { article_data: {} };
+    if (withTemplate) {
+        if (!templateEditor.dataset.loaded) return;
+        payload.template = templateEditor.value;
+    }
+
+    try {
+        const response = await fetch('/api/preview', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(payload),
+            signal: previewController.signal,
+        });
+        if (!response.ok) throw new Error('No se pudo generar la vista previa');
+        frame.srcdoc = await response.text();
+    } catch (error) {
+        if (error.name === 'AbortError') return;
+        console.error(error);
+    }
+}
 
 async function deleteArticle(articleId) {
     if (!confirm('¿Seguro que quieres eliminar este artículo?')) return;
@@ -230,6 +272,7 @@ async function saveTemplate() {
 }
 
 saveTemplateBtn?.addEventListener('click', saveTemplate);
+templateEditor?.addEventListener('input', () => schedulePreview(templatePreview, true));
 
 // Inicialización
 switchTab('create');
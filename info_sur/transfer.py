@@ -0,0 +1,292 @@
+"""Streaming NDJSON export and import of the article corpus."""
+from __future__ import annotations
+
+import gzip
+import json
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Union
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from .archive import archived_slugs, iter_archived_articles, replace_archived
+from .database import get_session
+from .models import Article, TemplateRevision
+
+EXPORT_BATCH_SIZE = 1000
+IMPORT_BATCH_SIZE = 2000
+CONFLICT_MODES = ("skip", "update")
+
+# INSERT ... ON CONFLICT DO NOTHING for the supported backends
+DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+RECORD_ARTICLE = "article"
+RECORD_TEMPLATE = "template_revision"
+
+ARTICLE_COLUMNS = (
+    "slug",
+    "timestamp",
+    "prompt",
+    "satire_level",
+    "image_prompt_primary",
+    "image_prompt_secondary",
+    "article_data",
+    "image_data",
+    "created_at",
+    "updated_at",
+)
+TEMPLATE_COLUMNS = ("template_html", "created_at")
+DATETIME_COLUMNS = ("created_at", "updated_at")
+REQUIRED_TEXT_COLUMNS = {
+    RECORD_ARTICLE: ("slug", "timestamp", "prompt"),
+    RECORD_TEMPLATE: ("template_html",),
+}
+OPTIONAL_TEXT_COLUMNS = ("image_prompt_primary", "image_prompt_secondary")
+# Range of the INTEGER column type on PostgreSQL
+INT32_MIN, INT32_MAX = -(2**31), 2**31 - 1
+
+
+def _serialize(record_type: str, row: Any, columns: Iterable[str]) -> str:
+    payload: Dict[str, Any] = {"type": record_type}
+    for column in columns:
+        value = getattr(row, column)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        payload[column] = value
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def _contains_nul(value: Any) -> bool:
+    if isinstance(value, str):
+        return "\x00" in value
+    if isinstance(value, dict):
+        return any(_contains_nul(key) or _contains_nul(item) for key, item in value.items())
+    if isinstance(value, list):
+        return any(_contains_nul(item) for item in value)
+    return False
+
+
+def _validate(record_type: str, payload: Dict[str, Any]) -> None:
+    """Reject records the database would refuse on insert.
+
+    Covers the NOT NULL columns and the limits PostgreSQL enforces (but
+    SQLite does not): VARCHAR lengths, the INTEGER range and NUL characters.
+    """
+    for column in REQUIRED_TEXT_COLUMNS[record_type]:
+        if not isinstance(payload.get(column), str) or not payload[column]:
+            raise ValueError(f"falta el campo '{column}'")
+    if _contains_nul(payload):
+        raise ValueError("el registro contiene caracteres NUL")
+    if record_type != RECORD_ARTICLE:
+        return
+    for column in ("slug", "timestamp"):
+        max_length = Article.__table__.c[column].type.length
+        if len(payload[column]) > max_length:
+            raise ValueError(f"'{column}' no puede superar {max_length} caracteres")
+    for column in OPTIONAL_TEXT_COLUMNS:
+        if payload.get(column) is not None and not isinstance(payload[column], str):
+            raise ValueError(f"'{column}' debe ser un texto")
+    if not isinstance(payload.get("article_data"), dict):
+        raise ValueError("'article_data' debe ser un objeto")
+    if payload.get("image_data") is not None and not isinstance(payload["image_data"], dict):
+        raise ValueError("'image_data' debe ser un objeto")
+    satire_level = payload.get("satire_level")
+    if satire_level is not None and (isinstance(satire_level, bool) or not isinstance(satire_level, int)):
+        raise ValueError("'satire_level' debe ser un entero")
+    if satire_level is not None and not INT32_MIN <= satire_level <= INT32_MAX:
+        raise ValueError("'satire_level' está fuera de rango")
+
+
+def _deserialize(payload: Dict[str, Any], columns: Iterable[str]) -> Dict[str, Any]:
+    values = {column: payload.get(column) for column in columns}
+    for column in DATETIME_COLUMNS:
+        if values.get(column):
+            if not isinstance(values[column], str):
+                raise ValueError(f"'{column}' debe ser una fecha ISO 8601")
+            try:
+                values[column] = datetime.fromisoformat(values[column])
+            except ValueError as exc:
+                raise ValueError(f"'{column}' debe ser una fecha ISO 8601") from exc
+        elif column in values:
+            values.pop(column)
+    return values
+
+
+def iter_export_lines(include_templates: bool = True, include_archive: bool = True) -> Iterator[str]:
+    """Yield one NDJSON line per article (and template revision).
+
+    Rows are fetched through a streaming cursor with ``yield_per`` so memory
+    use stays constant regardless of the corpus size. Archived articles follow
+    the hot ones in the same record format.
+    """
+    with get_session(readonly=True) as session:
+        if include_templates:
+            templates = session.execute(
+                select(*(TemplateRevision.__table__.c[c] for c in TEMPLATE_COLUMNS))
+                .order_by(TemplateRevision.created_at)
+                .execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE)
+            )
+            for row in templates:
+                yield _serialize(RECORD_TEMPLATE, row, TEMPLATE_COLUMNS)
+
+        articles = session.execute(
+            select(*(Article.__table__.c[c] for c in ARTICLE_COLUMNS))
+            .order_by(Article.id)
+            .execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE)
+        )
+        for row in articles:
+            yield _serialize(RECORD_ARTICLE, row, ARTICLE_COLUMNS)
+
+    if include_archive:
+        for article in iter_archived_articles(EXPORT_BATCH_SIZE):
+            yield _serialize(RECORD_ARTICLE, article, ARTICLE_COLUMNS)
+
+
+def iter_export_chunks(
+    compress: bool = False,
+    include_templates: bool = True,
+    include_archive: bool = True,
+) -> Iterator[bytes]:
+    """Yield the export as encoded byte chunks, optionally gzip-compressed."""
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    buffer: List[str] = []
+    for line in iter_export_lines(include_templates=include_templates, include_archive=include_archive):
+        buffer.append(line)
+        if len(buffer) < EXPORT_BATCH_SIZE:
+            continue
+        chunk = "".join(buffer).encode("utf-8")
+        buffer.clear()
+        if compressor:
+            chunk = compressor.compress(chunk)
+        if chunk:
+            yield chunk
+    chunk = "".join(buffer).encode("utf-8")
+    if compressor:
+        chunk = compressor.compress(chunk) + compressor.flush()
+    if chunk:
+        yield chunk
+
+
+def _insert_ignoring_conflicts(session: Session, rows: List[Dict[str, Any]]) -> Set[str]:
+    """Insert ``rows``, leaving alone any slug already in the table.
+
+    The unique slug index arbitrates, so concurrent imports of the same slug
+    cannot both insert it. Returns the slugs actually inserted.
+    """
+    dialect_insert = DIALECT_INSERTS.get(session.get_bind().dialect.name)
+    if dialect_insert is None:
+        # Other backends still get the unique index; a race raises instead
+        session.execute(insert(Article), rows)
+        return {row["slug"] for row in rows}
+    statement = dialect_insert(Article).on_conflict_do_nothing(index_elements=["slug"])
+    return set(session.scalars(statement.returning(Article.slug), rows))
+
+
+def _flush_articles(rows: List[Dict[str, Any]], on_conflict: str, stats: Dict[str, int]) -> None:
+    # Later lines win when the same slug appears twice within one batch.
+    by_slug = {row["slug"]: row for row in rows}
+    # Archived articles count as existing too, or a re-import would copy
+    # them back into the hot table.
+    archived = archived_slugs(by_slug)
+    if on_conflict == "update" and archived:
+        stats["updated"] += replace_archived(by_slug[slug] for slug in archived)
+    else:
+        stats["skipped"] += len(archived)
+    stats["skipped"] += len(rows) - len(by_slug)
+
+    with get_session() as session:
+        new_rows = [row for slug, row in by_slug.items() if slug not in archived]
+        inserted = _insert_ignoring_conflicts(session, new_rows) if new_rows else set()
+        stats["inserted"] += len(inserted)
+        conflicts = [row["slug"] for row in new_rows if row["slug"] not in inserted]
+        if on_conflict != "update" or not conflicts:
+            stats["skipped"] += len(conflicts)
+            return
+        existing = session.execute(select(Article.slug, Article.id).where(Article.slug.in_(conflicts))).all()
+        session.execute(update(Article), [{**by_slug[slug], "id": article_id} for slug, article_id in existing])
+        stats["updated"] += len(existing)
+
+
+def _flush_templates(rows: List[Dict[str, Any]], stats: Dict[str, int]) -> None:
+    with get_session() as session:
+        for row in rows:
+            query = select(TemplateRevision.id).where(
+                TemplateRevision.template_html == row["template_html"]
+            )
+            if row.get("created_at"):
+                query = query.where(TemplateRevision.created_at == row["created_at"])
+            if session.execute(query.limit(1)).first():
+                stats["skipped"] += 1
+                continue
+            session.execute(insert(TemplateRevision), [row])
+            stats["templates"] += 1
+
+
+def import_ndjson(
+    lines: Iterable[Union[str, bytes]],
+    on_conflict: str = "skip",
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> Dict[str, int]:
+    """Load NDJSON records produced by :func:`iter_export_lines`.
+
+    Articles are inserted in bulk, one transaction per batch. Rows whose slug
+    already exists, in the hot table or the archive, are skipped or
+    overwritten in place depending on ``on_conflict``.
+    """
+    if on_conflict not in CONFLICT_MODES:
+        raise ValueError(f"on_conflict debe ser uno de {', '.join(CONFLICT_MODES)}")
+
+    stats = {"inserted": 0, "updated": 0, "skipped": 0, "templates": 0}
+    articles: List[Dict[str, Any]] = []
+    templates: List[Dict[str, Any]] = []
+
+    for line_number, line in enumerate(lines, start=1):
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            payload = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Línea {line_number}: JSON no válido") from exc
+
+        if not isinstance(payload, dict):
+            raise ValueError(f"Línea {line_number}: se esperaba un objeto JSON")
+
+        record_type = payload.get("type", RECORD_ARTICLE)
+        if record_type not in REQUIRED_TEXT_COLUMNS:
+            raise ValueError(f"Línea {line_number}: tipo de registro desconocido '{record_type}'")
+        try:
+            _validate(record_type, payload)
+            if record_type == RECORD_TEMPLATE:
+                templates.append(_deserialize(payload, TEMPLATE_COLUMNS))
+                continue
+            row = _deserialize(payload, ARTICLE_COLUMNS)
+        except ValueError as exc:
+            raise ValueError(f"Línea {line_number}: {exc}") from exc
+        row["image_data"] = row.get("image_data") or {}
+        if row.get("satire_level") is None:
+            row.pop("satire_level")
+        articles.append(row)
+
+        if len(articles) >= batch_size:
+            _flush_articles(articles, on_conflict, stats)
+            articles = []
+
+    if templates:
+        _flush_templates(templates, stats)
+    if articles:
+        _flush_articles(articles, on_conflict, stats)
+    return stats
+
+
+def open_ndjson(path: str, mode: str = "rb", compress: Optional[bool] = None):
+    """Open ``path`` for NDJSON transfer, using gzip for ``.gz`` files."""
+    if compress is None:
+        compress = path.endswith(".gz")
+    if compress:
+        return gzip.open(path, mode)
+    return open(path, mode)
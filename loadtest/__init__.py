@@ -0,0 +1,5 @@
+"""Load-testing harness for Info Sur with a local fake OpenAI server."""
+from .fake_openai import FakeOpenAIServer
+from .harness import LoadTestConfig, run_load_test
+
+__all__ = ["FakeOpenAIServer", "LoadTestConfig", "run_load_test"]
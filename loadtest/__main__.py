@@ -0,0 +1,70 @@
+"""Command-line entry point: ``python -m loadtest``."""
+from __future__ import annotations
+
+import argparse
+import json
+from typing import Dict, List, Optional
+
+from .harness import DEFAULT_MIX, LoadTestConfig, format_report, run_load_test
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Parse ``read=70,list=10,...`` into operation weights."""
+    mix: Dict[str, float] = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(
+                f"operación desconocida '{name}' (usa {', '.join(DEFAULT_MIX)})"
+            )
+        try:
+            mix[name] = float(weight)
+        except ValueError as exc:
+            raise argparse.ArgumentTypeError(f"peso no válido para '{name}'") from exc
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("al menos una operación debe tener peso")
+    return mix
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    defaults = LoadTestConfig()
+    parser = argparse.ArgumentParser(description="Prueba de carga de Info Sur bajo gunicorn.")
+    parser.add_argument("--duration", type=float, default=defaults.duration, help="Segundos de carga.")
+    parser.add_argument("--concurrency", type=int, default=defaults.concurrency, help="Clientes simultáneos.")
+    parser.add_argument("--workers", type=int, default=defaults.workers, help="Workers de gunicorn.")
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=dict(DEFAULT_MIX),
+        help="Pesos por operación, p. ej. read=70,list=10,get=10,update=8,generate=2.",
+    )
+    parser.add_argument("--seed-articles", type=int, default=defaults.seed_articles)
+    parser.add_argument("--chat-latency", type=float, default=defaults.chat_latency, help="Latencia simulada del chat (s).")
+    parser.add_argument("--image-latency", type=float, default=defaults.image_latency, help="Latencia simulada de imágenes (s).")
+    parser.add_argument("--jitter", type=float, default=defaults.jitter, help="Variación aleatoria de latencia (s).")
+    parser.add_argument("--openai-error-rate", type=float, default=defaults.openai_error_rate)
+    parser.add_argument("--image-prompts", type=int, choices=(0, 1, 2), default=defaults.image_prompts,
+                        help="Imágenes a generar por artículo.")
+    parser.add_argument("--template", dest="template_path", help="Template HTML a usar (por defecto uno de ejemplo).")
+    parser.add_argument(
+        "--database-url",
+        help="Base de datos de la app (por defecto SQLite temporal). ¡Se modifica! La prueba importa "
+             "artículos de semilla, los edita, genera otros y al final los borra; los artículos y el "
+             "template existentes no se tocan. Usa una base desechable o una copia.",
+    )
+    parser.add_argument("--port", type=int, default=defaults.port, help="Puerto de gunicorn (0 = libre).")
+    parser.add_argument("--json", action="store_true", help="Imprimir el informe como JSON.")
+    args = parser.parse_args(argv)
+    if args.database_url and args.template_path:
+        parser.error("--template solo se aplica a la base temporal; no se puede combinar con --database-url")
+
+    options = vars(args)
+    as_json = options.pop("json")
+    report = run_load_test(LoadTestConfig(**options))
+    print(json.dumps(report, indent=2, ensure_ascii=False) if as_json else format_report(report))
+    return 1 if report["total"]["errors"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
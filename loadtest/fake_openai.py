@@ -0,0 +1,154 @@
+"""Local stand-in for the OpenAI chat completions and images APIs."""
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+
+def fake_article(index: int) -> Dict[str, Any]:
+    """Return an article payload shaped like the generator's JSON response."""
+    paragraphs = {
+        f"mod_cuerpo{n}": f"Párrafo {n} de la noticia simulada número {index}. Todo ocurre en Málaga."
+        for n in range(1, 8)
+    }
+    return {
+        "slug_title": f"Noticia simulada {index}",
+        "modules": {
+            "mod_titulo": f"Noticia simulada {index}",
+            "mod_subtitulo": "Subtítulo generado por el servidor de pruebas",
+            "mod_autores": ["Redacción", "Agencias"],
+            "mod_ciudad": "Málaga",
+            "mod_fecha": "Lunes, 1 de enero 2024, 12:00 | Actualizado 12:30h.",
+            "mod_pie1": "Pie de la imagen principal",
+            "mod_relacionada": "Otra noticia relacionada",
+            "mod_pie2": "Pie de la imagen secundaria",
+            "mod_catchline": "Última hora",
+            **paragraphs,
+        },
+        "temas": ["Málaga", "Feria", "Tráfico"],
+        "imagenes": {"primary": "Una imagen", "secondary": "Otra imagen"},
+    }
+
+
+class FakeOpenAIServer:
+    """Serve ``/v1/chat/completions`` and ``/v1/images/generations`` locally.
+
+    Each response is delayed by ``latency`` seconds (plus up to ``jitter``
+    seconds at random) to mimic the real API. ``error_rate`` makes a fraction
+    of requests fail with HTTP 500.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        chat_latency: float = 0.5,
+        image_latency: float = 1.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+    ) -> None:
+        self.chat_latency = chat_latency
+        self.image_latency = image_latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests = {"chat": 0, "images": 0}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        return self._server.server_address[:2]
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.address
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _count(self, kind: str) -> int:
+        with self._lock:
+            self.requests[kind] += 1
+            return self.requests[kind]
+
+    def _delay(self, latency: float) -> None:
+        time.sleep(latency + random.uniform(0, self.jitter))
+
+    def _chat_response(self) -> Dict[str, Any]:
+        index = self._count("chat")
+        self._delay(self.chat_latency)
+        return {
+            "id": f"chatcmpl-fake-{index}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "gpt-4o",
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": json.dumps(fake_article(index))},
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+    def _images_response(self) -> Dict[str, Any]:
+        index = self._count("images")
+        self._delay(self.image_latency)
+        return {
+            "created": int(time.time()),
+            "data": [{"url": f"https://images.invalid/fake-{index}.png"}],
+        }
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                self.rfile.read(length)
+                if self.path.endswith("/chat/completions"):
+                    builder = server._chat_response
+                elif self.path.endswith("/images/generations"):
+                    builder = server._images_response
+                else:
+                    self._send(404, {"error": {"message": "Not found"}})
+                    return
+                if random.random() < server.error_rate:
+                    self._send(500, {"error": {"message": "Simulated failure"}})
+                    return
+                self._send(200, builder())
+
+            def _send(self, status: int, payload: Dict[str, Any]) -> None:
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
@@ -0,0 +1,350 @@
+"""Drive a mixed workload against Info Sur running under gunicorn."""
+from __future__ import annotations
+
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .fake_openai import FakeOpenAIServer, fake_article
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_MIX: Dict[str, float] = {
+    "read": 70,
+    "list": 10,
+    "get": 10,
+    "update": 8,
+    "generate": 2,
+}
+
+SAMPLE_TEMPLATE = """<!doctype html>
+<html amp lang="es">
+<head><meta charset="utf-8"><title>Info Sur</title></head>
+<body>
+<h1 class="mod_titulo"></h1><h2 class="mod_subtitulo"></h2>
+<p>Por <span class="mod_autores"></span> · <span class="mod_ciudad"></span> · <span class="mod_fecha"></span></p>
+<figure><img class="mod_pie1" src="/images/placeholder.jpg" alt=""><figcaption class="mod_pie1"></figcaption></figure>
+<p class="mod_cuerpo1"></p><p class="mod_cuerpo2"></p><aside class="mod_relacionada"></aside>
+<figure><img class="mod_pie2" src="/images/placeholder.jpg" alt=""><figcaption class="mod_pie2"></figcaption></figure>
+<p class="mod_cuerpo3"></p><p class="mod_cuerpo4"></p><blockquote class="mod_catchline"></blockquote>
+<p class="mod_cuerpo5"></p><p class="mod_cuerpo6"></p><p class="mod_cuerpo7"></p>
+<ul><li class="mod_tema1"></li><li class="mod_tema2"></li><li class="mod_tema3"></li>
+<li class="mod_tema4"></li><li class="mod_tema5"></li><li class="mod_tema6"></li></ul>
+</body>
+</html>
+"""
+
+
+@dataclass
+class LoadTestConfig:
+    duration: float = 30.0
+    concurrency: int = 16
+    workers: int = 3
+    mix: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    seed_articles: int = 200
+    chat_latency: float = 0.5
+    image_latency: float = 1.0
+    jitter: float = 0.1
+    openai_error_rate: float = 0.0
+    image_prompts: int = 0
+    template_path: Optional[str] = None
+    database_url: Optional[str] = None
+    port: int = 0
+    timeout: float = 30.0
+
+
+@dataclass
+class OperationStats:
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+
+    @property
+    def count(self) -> int:
+        return len(self.latencies)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(stats: Dict[str, OperationStats], elapsed: float) -> Dict[str, Any]:
+    """Build the report: latency percentiles (ms), throughput and error rates."""
+    report: Dict[str, Any] = {"elapsed_seconds": round(elapsed, 3), "operations": {}}
+    all_latencies: List[float] = []
+    total_errors = 0
+    for name, op in sorted(stats.items()):
+        latencies = sorted(op.latencies)
+        all_latencies.extend(latencies)
+        total_errors += op.errors
+        report["operations"][name] = _summary_row(latencies, op.errors, elapsed)
+    report["total"] = _summary_row(sorted(all_latencies), total_errors, elapsed)
+    return report
+
+
+def _summary_row(latencies: List[float], errors: int, elapsed: float) -> Dict[str, float]:
+    count = len(latencies)
+    return {
+        "requests": count,
+        "errors": errors,
+        "error_rate": round(errors / count, 4) if count else 0.0,
+        "throughput_rps": round(count / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    header = f"{'operation':<10} {'reqs':>7} {'err%':>6} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    lines = [header, "-" * len(header)]
+    rows = list(report["operations"].items()) + [("TOTAL", report["total"])]
+    for name, row in rows:
+        lines.append(
+            f"{name:<10} {row['requests']:>7} {row['error_rate'] * 100:>5.1f}% "
+            f"{row['throughput_rps']:>8.1f} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f}"
+        )
+    lines.append(f"\nDuración: {report['elapsed_seconds']} s")
+    return "\n".join(lines)
+
+
+class Client:
+    """Minimal JSON HTTP client built on urllib."""
+
+    def __init__(self, base_url: str, timeout: float) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def request(self, method: str, path: str, payload: Any = None, body: Optional[bytes] = None,
+                content_type: str = "application/json") -> Tuple[int, bytes]:
+        if payload is not None:
+            body = json.dumps(payload).encode("utf-8")
+        req = urllib.request.Request(self.base_url + path, data=body, method=method)
+        if body is not None:
+            req.add_header("Content-Type", content_type)
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as exc:
+            return exc.code, exc.read()
+
+    def json(self, method: str, path: str, payload: Any = None) -> Any:
+        status, body = self.request(method, path, payload)
+        if status >= 400:
+            raise RuntimeError(f"{method} {path} devolvió {status}")
+        return json.loads(body)
+
+
+class Workload:
+    """Issue one randomly chosen operation at a time against the app.
+
+    Reads, gets and updates only touch the seeded ``articles``; the ids of
+    generated articles are kept in ``created`` so they can be cleaned up.
+    """
+
+    def __init__(self, client: Client, config: LoadTestConfig, articles: List[Dict[str, Any]]) -> None:
+        self.client = client
+        self.config = config
+        self.articles = articles
+        self.created: List[int] = []
+        self.operations = list(config.mix)
+        self.weights = [config.mix[name] for name in self.operations]
+        self.stats: Dict[str, OperationStats] = {name: OperationStats() for name in self.operations}
+        self._lock = threading.Lock()
+
+    def run_one(self, rng: random.Random) -> None:
+        name = rng.choices(self.operations, self.weights)[0]
+        started = time.perf_counter()
+        try:
+            status = getattr(self, f"_op_{name}")(rng)
+            failed = status >= 400
+        except Exception:
+            failed = True
+        latency = time.perf_counter() - started
+        with self._lock:
+            self.stats[name].latencies.append(latency)
+            if failed:
+                self.stats[name].errors += 1
+
+    def _op_read(self, rng: random.Random) -> int:
+        article = rng.choice(self.articles)
+        return self.client.request("GET", f"/{article['slug']}")[0]
+
+    def _op_list(self, rng: random.Random) -> int:
+        return self.client.request("GET", "/api/articles")[0]
+
+    def _op_get(self, rng: random.Random) -> int:
+        article = rng.choice(self.articles)
+        return self.client.request("GET", f"/api/articles/{article['id']}")[0]
+
+    def _op_update(self, rng: random.Random) -> int:
+        article = rng.choice(self.articles)
+        payload = {"article_data": {"mod_subtitulo": f"Editado {rng.randint(0, 10**6)}"}}
+        return self.client.request("PUT", f"/api/articles/{article['id']}", payload)[0]
+
+    def _op_generate(self, rng: random.Random) -> int:
+        payload = {
+            "prompt": "Noticia de prueba de carga",
+            "satire_level": rng.randint(0, 100),
+            "image_prompts": ["Imagen principal", "Imagen secundaria"][: self.config.image_prompts],
+        }
+        status, body = self.client.request("POST", "/api/articles", payload)
+        if status == 201:
+            with self._lock:
+                self.created.append(json.loads(body)["id"])
+        return status
+
+
+def seed(client: Client, config: LoadTestConfig) -> List[Dict[str, Any]]:
+    """Install the template and bulk-import the seed articles.
+
+    Against a ``database_url`` the existing template is left alone, and the
+    seed slugs carry a per-run tag so they never collide with real articles.
+    Returns the seeded articles (id and slug).
+    """
+    if not config.database_url:
+        template = SAMPLE_TEMPLATE
+        if config.template_path:
+            template = Path(config.template_path).read_text(encoding="utf-8")
+        client.json("PUT", "/api/template", {"template": template})
+
+    run_tag = uuid.uuid4().hex[:8]
+    lines = []
+    for index in range(config.seed_articles):
+        modules = fake_article(index)["modules"]
+        modules["mod_autores"] = " y ".join(modules["mod_autores"])
+        timestamp = f"2024{index:010d}"
+        lines.append(json.dumps({
+            "type": "article",
+            "slug": f"noticia-simulada-{run_tag}-{index}-{timestamp}",
+            "timestamp": timestamp,
+            "prompt": "Semilla de prueba de carga",
+            "article_data": {**modules, "temas": ["Málaga", "Feria"]},
+            "image_data": {},
+        }))
+    status, body = client.request(
+        "POST", "/api/import", body="\n".join(lines).encode("utf-8"), content_type="application/x-ndjson"
+    )
+    if status >= 400:
+        raise RuntimeError(f"No se pudieron importar los artículos: {body[:200]!r}")
+    prefix = f"noticia-simulada-{run_tag}-"
+    return [article for article in client.json("GET", "/api/articles") if article["slug"].startswith(prefix)]
+
+
+def cleanup(client: Client, article_ids: List[int]) -> None:
+    """Delete the articles the run seeded or generated."""
+    for article_id in article_ids:
+        client.request("DELETE", f"/api/articles/{article_id}")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_gunicorn(port: int, workers: int, env: Dict[str, str]) -> subprocess.Popen:
+    command = [
+        sys.executable, "-m", "gunicorn",
+        "--preload",
+        "-w", str(workers),
+        "-b", f"127.0.0.1:{port}",
+        "--log-level", "warning",
+        "info_sur.app:create_app()",
+    ]
+    return subprocess.Popen(command, cwd=PROJECT_ROOT, env=env)
+
+
+def wait_until_ready(client: Client, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("gunicorn terminó antes de estar listo")
+        try:
+            if client.request("GET", "/editor")[0] == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError("gunicorn no respondió a tiempo")
+
+
+def run_load_test(config: LoadTestConfig) -> Dict[str, Any]:
+    """Start the fake OpenAI server and gunicorn, run the workload, return the report."""
+    if config.database_url and config.template_path:
+        raise ValueError("template_path no se puede combinar con database_url")
+    port = config.port or _free_port()
+    with tempfile.TemporaryDirectory() as data_dir, FakeOpenAIServer(
+        chat_latency=config.chat_latency,
+        image_latency=config.image_latency,
+        jitter=config.jitter,
+        error_rate=config.openai_error_rate,
+    ) as fake_openai:
+        env = dict(os.environ)
+        env.update({
+            "OPENAI_API_KEY": "sk-fake-load-test",
+            "OPENAI_BASE_URL": fake_openai.base_url,
+            "DATABASE_PATH": str(Path(data_dir) / "articles.db"),
+            "ARCHIVE_PATH": str(Path(data_dir) / "archive.db"),
+            "FLASK_RATELIMIT_ENABLED": "false",
+        })
+        env.pop("DATABASE_REPLICA_URL", None)
+        env.pop("ARCHIVE_DATABASE_URL", None)
+        if config.database_url:
+            env["DATABASE_URL"] = config.database_url
+        else:
+            env.pop("DATABASE_URL", None)
+        process = start_gunicorn(port, config.workers, env)
+        try:
+            client = Client(f"http://127.0.0.1:{port}", config.timeout)
+            wait_until_ready(client, process)
+            articles = seed(client, config)
+            workload = Workload(client, config, articles)
+            try:
+                deadline = time.monotonic() + config.duration
+
+                def worker(worker_id: int) -> None:
+                    rng = random.Random(worker_id)
+                    while time.monotonic() < deadline:
+                        workload.run_one(rng)
+
+                threads = [threading.Thread(target=worker, args=(i,)) for i in range(config.concurrency)]
+                started = time.perf_counter()
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                elapsed = time.perf_counter() - started
+            finally:
+                cleanup(client, [article["id"] for article in articles] + workload.created)
+        finally:
+            process.terminate()
+            process.wait(timeout=10)
+
+    report = summarize(workload.stats, elapsed)
+    report["config"] = {
+        "workers": config.workers,
+        "concurrency": config.concurrency,
+        "mix": config.mix,
+        "seed_articles": config.seed_articles,
+        "chat_latency": config.chat_latency,
+        "image_latency": config.image_latency,
+    }
+    report["openai_requests"] = dict(fake_openai.requests)
+    return report
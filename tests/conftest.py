@@ -1,23 +1,90 @@
-"""Pytest configuration and fixtures."""
+"""Pytest configuration and fixtures.
+
+The suite runs against SQLite by default. ``pytest --db=postgres`` (or
+``INFOSUR_TEST_DB=postgres``) runs it against PostgreSQL instead: the server
+at ``TEST_POSTGRES_URL`` if set, otherwise a throwaway local instance started
+with the ``pgserver`` package.
+"""
 import pytest
 from pathlib import Path
 import tempfile
 import os
 
-from info_sur.app import create_app
-from info_sur.database import Base, engine
+_TEST_DATA_DIR = tempfile.TemporaryDirectory()
+_PGSERVER = None
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--db',
+        choices=('sqlite', 'postgres'),
+        default=os.environ.get('INFOSUR_TEST_DB', 'sqlite'),
+        help='Database backend to run the tests against.',
+    )
+
+
+def pytest_configure(config):
+    """Point the app at the test database; must run before info_sur is imported."""
+    global _PGSERVER
+    os.environ['DATABASE_PATH'] = str(Path(_TEST_DATA_DIR.name) / 'test.db')
+    os.environ['ARCHIVE_PATH'] = str(Path(_TEST_DATA_DIR.name) / 'archive.db')
+    os.environ.pop('ARCHIVE_DATABASE_URL', None)
+    os.environ.pop('DATABASE_REPLICA_URL', None)
+    if config.getoption('--db') != 'postgres':
+        os.environ.pop('DATABASE_URL', None)
+        return
+
+    url = os.environ.get('TEST_POSTGRES_URL')
+    if not url:
+        try:
+            import pgserver
+        except ImportError as exc:
+            raise pytest.UsageError(
+                '--db=postgres needs TEST_POSTGRES_URL or the pgserver package'
+            ) from exc
+        _PGSERVER = pgserver.get_server(Path(_TEST_DATA_DIR.name) / 'pgdata', cleanup_mode='stop')
+        url = _PGSERVER.get_uri()
+    os.environ['DATABASE_URL'] = url
+
+
+def pytest_unconfigure(config):
+    if _PGSERVER is not None:
+        _PGSERVER.cleanup()
+
+
+def pytest_report_header(config):
+    return f"database: {config.getoption('--db')}"
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Show the figures recorded by benchmark tests, which -v alone would hide."""
+    reports = [
+        report
+        for outcome in ('passed', 'failed')
+        for report in terminalreporter.stats.get(outcome, [])
+        if getattr(report, 'when', None) == 'call' and 'benchmark' in report.keywords
+    ]
+    if not reports:
+        return
+    terminalreporter.section('benchmarks')
+    for report in reports:
+        figures = ', '.join(f'{name}={value:,}' for name, value in report.user_properties)
+        terminalreporter.write_line(f'{report.nodeid}: {figures}')
 
 
 @pytest.fixture
 def app():
     """Create application for testing."""
-    # Use a temporary database for testing
-    with tempfile.TemporaryDirectory() as tmpdir:
-        os.environ['DATABASE_PATH'] = str(Path(tmpdir) / 'test.db')
-        app = create_app()
-        app.config['TESTING'] = True
+    from info_sur.app import create_app
+    from info_sur.database import ArchiveBase, Base, archive_engine, engine
+
+    app = create_app()
+    app.config['TESTING'] = True
+
+    yield app
 
-        yield app
+    Base.metadata.drop_all(engine)
+    ArchiveBase.metadata.drop_all(archive_engine)
 
 
 @pytest.fixture
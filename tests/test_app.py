@@ -87,3 +87,52 @@ def test_serve_article_nonexistent(client):
     """Test that nonexistent article returns 404."""
     response = client.get('/test-article-20231225120000')
     assert response.status_code == 404
+
+
+PREVIEW_TEMPLATE = (
+    '<html><body><h1 class="mod_titulo">Viejo</h1>'
+    '<a class="mod_tema1">t1</a><a class="mod_tema2">t2</a></body></html>'
+)
+
+
+def test_api_preview_with_candidate_template(client):
+    """Test previewing unsaved data against a candidate template."""
+    response = client.post('/api/preview', json={
+        'article_data': {'mod_titulo': 'Titular nuevo'},
+        'temas': ['Feria'],
+        'template': PREVIEW_TEMPLATE,
+    })
+    assert response.status_code == 200
+    assert response.mimetype == 'text/html'
+    assert response.headers['Content-Security-Policy'].startswith('sandbox')
+    html = response.get_data(as_text=True)
+    assert 'Titular nuevo' in html
+    assert 'Feria' in html
+    assert 'mod_tema2' not in html
+
+
+def test_api_preview_does_not_write(client):
+    """Test that previewing does not create articles."""
+    client.post('/api/preview', json={'article_data': {}, 'template': PREVIEW_TEMPLATE})
+    assert client.get('/api/articles').get_json() == []
+
+
+@pytest.mark.parametrize('payload', [
+    {'article_data': {}, 'template': 1},
+    {'article_data': 'abc'},
+    {'article_data': {}, 'image_data': ['x']},
+    {'article_data': {}, 'temas': 'Feria'},
+    ['no', 'es', 'un', 'objeto'],
+])
+def test_api_preview_invalid_payload(client, payload):
+    """Test that malformed preview payloads are rejected."""
+    response = client.post('/api/preview', json=payload)
+    assert response.status_code == 400
+
+
+def test_api_preview_has_own_rate_limit(client):
+    """Test that previews are limited, but well above the default limits."""
+    payload = {'article_data': {}, 'template': PREVIEW_TEMPLATE}
+    for _ in range(600):
+        assert client.post('/api/preview', json=payload).status_code == 200
+    assert client.post('/api/preview', json=payload).status_code == 429
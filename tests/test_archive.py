@@ -0,0 +1,206 @@
+"""Test hot/cold article tiering."""
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from info_sur import archive
+from info_sur.archive import archive_articles, compact_hot_store, restore_article
+from info_sur.database import engine, get_archive_session, get_session
+from info_sur.models import Article, ArchivedArticle
+from info_sur.services import (
+    get_article,
+    get_article_by_slug,
+    list_articles,
+    save_template_html,
+    update_article,
+)
+from info_sur.transfer import import_ndjson, iter_export_lines
+
+TEMPLATE = '<html><body><h1 class="mod_titulo">Viejo</h1></body></html>'
+
+
+def add_article(slug, age_days, title='Noticia', edited_days=None):
+    """Insert an article created (and last edited) ``age_days`` ago."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    created_at = now - timedelta(days=age_days)
+    updated_at = now - timedelta(days=age_days if edited_days is None else edited_days)
+    with get_session() as session:
+        session.add(Article(
+            slug=slug,
+            timestamp=created_at.strftime('%Y%m%d%H%M%S'),
+            prompt='Prueba',
+            article_data={'mod_titulo': title, 'temas': ['Málaga']},
+            image_data={'primary': 'https://x.test/a.jpg'},
+            created_at=created_at,
+            updated_at=updated_at,
+        ))
+
+
+def test_archive_moves_only_old_articles(app):
+    """Test that only articles past the cutoff leave the hot table."""
+    add_article('vieja-20200101120000', age_days=800)
+    add_article('nueva-20240101120000', age_days=3)
+
+    assert archive_articles(older_than_days=365, batch_size=1) == 1
+    assert [a['slug'] for a in list_articles()] == ['nueva-20240101120000']
+    with get_archive_session() as session:
+        assert session.query(ArchivedArticle.slug).scalar() == 'vieja-20200101120000'
+
+    assert archive_articles(older_than_days=365) == 0
+
+
+def test_recently_edited_articles_stay_hot(app):
+    """Test that an old article edited recently is not archived."""
+    add_article('vieja-20200101120000', age_days=800, edited_days=2)
+    assert archive_articles(older_than_days=365) == 0
+
+
+def test_article_edited_while_archiving_stays_hot(app, monkeypatch):
+    """Test that an edit landing between packing and deleting is not lost."""
+    add_article('vieja-20200101120000', age_days=800, title='Original')
+    add_article('otra-20200101120000', age_days=800)
+    pack = archive.pack_article
+
+    def pack_then_edit(article):
+        packed = pack(article)
+        if article.slug == 'vieja-20200101120000':
+            update_article(article.id, {'article_data': {'mod_titulo': 'Editado'}})
+        return packed
+
+    monkeypatch.setattr(archive, 'pack_article', pack_then_edit)
+    assert archive_articles(older_than_days=365) == 1
+
+    assert [a['slug'] for a in list_articles()] == ['vieja-20200101120000']
+    assert get_article_by_slug('vieja-20200101120000').article_data['mod_titulo'] == 'Editado'
+    with get_archive_session() as session:
+        assert session.query(ArchivedArticle.slug).all() == [('otra-20200101120000',)]
+
+
+def test_duplicate_hot_slugs_are_not_destroyed(app):
+    """Test that only the archived copy of a duplicated slug leaves the hot table."""
+    next(index for index in Article.__table__.indexes if index.unique).drop(engine)
+    add_article('doble-20200101120000', age_days=800, title='Primera')
+    add_article('doble-20200101120000', age_days=800, title='Segunda')
+
+    assert archive_articles(older_than_days=365) == 1
+    assert archive_articles(older_than_days=365) == 0
+    with get_session() as session:
+        assert session.query(Article.article_data).one()[0]['mod_titulo'] == 'Segunda'
+    with get_archive_session() as session:
+        archived = archive.unpack_article(session.query(ArchivedArticle).one())
+        assert archived.article_data['mod_titulo'] == 'Primera'
+
+
+def test_get_article_by_slug_falls_back_to_archive(app):
+    """Test that archived articles are still readable by slug."""
+    add_article('vieja-20200101120000', age_days=800, title='Titular archivado')
+    archive_articles(older_than_days=365)
+
+    article = get_article_by_slug('vieja-20200101120000')
+    assert article.article_data['mod_titulo'] == 'Titular archivado'
+    assert article.article_data['temas'] == ['Málaga']
+    assert article.image_data['primary'] == 'https://x.test/a.jpg'
+    assert get_article_by_slug('otra-20200101120000') is None
+
+
+def test_serve_archived_article(client):
+    """Test that the public page renders archived articles."""
+    save_template_html(TEMPLATE)
+    add_article('vieja-20200101120000', age_days=800, title='Titular archivado')
+    archive_articles(older_than_days=365)
+
+    response = client.get('/vieja-20200101120000')
+    assert response.status_code == 200
+    assert 'Titular archivado' in response.get_data(as_text=True)
+
+
+def test_restore_article(app):
+    """Test moving an archived article back to the hot table."""
+    add_article('vieja-20200101120000', age_days=800)
+    archive_articles(older_than_days=365)
+
+    assert restore_article('vieja-20200101120000') is True
+    assert restore_article('vieja-20200101120000') is False
+    [listed] = list_articles()
+    assert get_article(listed['id']).slug == 'vieja-20200101120000'
+
+    # The nightly run must not move it straight back
+    assert archive_articles(older_than_days=365) == 0
+    assert len(list_articles()) == 1
+
+
+def test_restore_article_already_hot(app):
+    """Test that restoring a slug already in the hot table is reported."""
+    add_article('vieja-20200101120000', age_days=800)
+    archive_articles(older_than_days=365)
+    add_article('vieja-20200101120000', age_days=1)
+
+    with pytest.raises(ValueError):
+        restore_article('vieja-20200101120000')
+    with get_archive_session() as session:
+        assert session.query(ArchivedArticle).count() == 1
+
+
+def test_export_includes_archived_articles(app):
+    """Test that backups contain both tiers."""
+    add_article('vieja-20200101120000', age_days=800)
+    add_article('nueva-20240101120000', age_days=3)
+    archive_articles(older_than_days=365)
+
+    lines = list(iter_export_lines(include_templates=False))
+    assert len(lines) == 2
+    assert len(list(iter_export_lines(include_templates=False, include_archive=False))) == 1
+
+
+def test_export_import_roundtrip_keeps_tiers(app):
+    """Test that re-importing an export does not copy archived rows back."""
+    add_article('vieja-20200101120000', age_days=800, title='Original')
+    add_article('nueva-20240101120000', age_days=3)
+    archive_articles(older_than_days=365)
+    lines = list(iter_export_lines(include_templates=False))
+
+    stats = import_ndjson(lines)
+    assert stats['inserted'] == 0
+    assert stats['skipped'] == 2
+    assert [a['slug'] for a in list_articles()] == ['nueva-20240101120000']
+
+    edited = [json.loads(line) for line in lines]
+    for record in edited:
+        record['article_data']['mod_titulo'] = 'Editado'
+    stats = import_ndjson([json.dumps(r) for r in edited], on_conflict='update')
+    assert stats['updated'] == 2
+    assert stats['inserted'] == 0
+    assert len(list_articles()) == 1
+    archived = get_article_by_slug('vieja-20200101120000')
+    assert archived.article_data['mod_titulo'] == 'Editado'
+    assert archived.satire_level == 50
+
+
+def test_cli_archive_articles(runner):
+    """Test the archive-articles command, including compaction."""
+    add_article('vieja-20200101120000', age_days=800)
+    result = runner.invoke(args=['archive-articles', '--older-than-days', '365'])
+    assert result.exit_code == 0
+    assert 'Archivados 1' in result.output
+
+    result = runner.invoke(args=['restore-article', 'nada-20200101120000'])
+    assert result.exit_code != 0
+
+
+def test_compact_hot_store_shrinks_sqlite_file(app):
+    """Test that compaction after archiving returns pages to the filesystem."""
+    if engine.dialect.name != 'sqlite':
+        pytest.skip('page counts are only observable on SQLite')
+    filler = 'x' * 4000
+    for index in range(200):
+        add_article(f'vieja-{index}-20200101120000', age_days=800, title=filler)
+
+    def page_count():
+        with engine.connect() as connection:
+            return connection.exec_driver_sql('PRAGMA page_count').scalar()
+
+    archive_articles(older_than_days=365)
+    before = page_count()
+    compact_hot_store()
+    assert page_count() < before / 2
@@ -0,0 +1,114 @@
+"""Test the load-testing harness and the fake OpenAI server."""
+import argparse
+
+import pytest
+from sqlalchemy.orm import Session
+
+from info_sur.database import Base, build_engine
+from info_sur.models import Article, TemplateRevision
+from info_sur.services import generate_article_via_openai
+from loadtest import FakeOpenAIServer, LoadTestConfig, run_load_test
+from loadtest.__main__ import main, parse_mix
+from loadtest.harness import SAMPLE_TEMPLATE, OperationStats, percentile, summarize
+
+
+def test_percentile_nearest_rank():
+    """Test nearest-rank percentiles."""
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 99) == 0.0
+
+
+def test_summarize_reports_error_rate_and_throughput():
+    """Test the report aggregates per operation and in total."""
+    stats = {
+        "read": OperationStats(latencies=[0.01, 0.02, 0.03, 0.04], errors=1),
+        "list": OperationStats(latencies=[0.1]),
+    }
+    report = summarize(stats, elapsed=2.0)
+    assert report["operations"]["read"]["error_rate"] == 0.25
+    assert report["operations"]["read"]["p50_ms"] == 20.0
+    assert report["total"]["requests"] == 5
+    assert report["total"]["throughput_rps"] == 2.5
+
+
+def test_parse_mix():
+    """Test parsing the operation mix from the command line."""
+    assert parse_mix("read=80,generate=20") == {"read": 80.0, "generate": 20.0}
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_mix("delete=1")
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_mix("read=0")
+
+
+def test_generate_article_uses_openai_base_url(monkeypatch):
+    """Test that generation can be pointed at a compatible local server."""
+    with FakeOpenAIServer(chat_latency=0, image_latency=0) as server:
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+        monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+        result = generate_article_via_openai("Prueba", 50, ["Una imagen"])
+
+    assert result["modules"]["mod_ciudad"] == "Málaga"
+    assert result["modules"]["mod_autores"] == "Redacción y Agencias"
+    assert result["image_urls"]["primary"].startswith("https://images.invalid/")
+    assert server.requests == {"chat": 1, "images": 1}
+
+
+def test_run_load_test_end_to_end():
+    """Run a short mixed workload against gunicorn."""
+    config = LoadTestConfig(
+        duration=1.0,
+        concurrency=2,
+        workers=1,
+        seed_articles=5,
+        chat_latency=0.01,
+        image_latency=0.01,
+        jitter=0,
+    )
+    report = run_load_test(config)
+    assert report["total"]["requests"] > 0
+    assert report["total"]["errors"] == 0
+    assert set(report["operations"]) == set(config.mix)
+
+
+def test_run_load_test_leaves_existing_database_intact(tmp_path):
+    """Test that --database-url only touches the rows the run creates."""
+    url = f"sqlite:///{tmp_path / 'existing.db'}"
+    engine = build_engine(url)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(TemplateRevision(template_html=SAMPLE_TEMPLATE))
+        session.add(Article(
+            slug='real-20240101120000',
+            timestamp='20240101120000',
+            prompt='Real',
+            article_data={'mod_titulo': 'Real', 'mod_subtitulo': 'Intacto'},
+        ))
+        session.commit()
+
+    report = run_load_test(LoadTestConfig(
+        duration=1.0,
+        concurrency=2,
+        workers=1,
+        seed_articles=5,
+        chat_latency=0.01,
+        image_latency=0.01,
+        jitter=0,
+        database_url=url,
+    ))
+    assert report["total"]["errors"] == 0
+
+    with Session(engine) as session:
+        article = session.query(Article).one()
+        assert article.slug == 'real-20240101120000'
+        assert article.article_data['mod_subtitulo'] == 'Intacto'
+        assert session.query(TemplateRevision).count() == 1
+    engine.dispose()
+
+
+def test_template_requires_throwaway_database():
+    """Test that a custom template cannot overwrite an existing database's template."""
+    with pytest.raises(SystemExit):
+        main(['--database-url', 'sqlite:///x.db', '--template', 'template.html'])
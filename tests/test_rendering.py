@@ -0,0 +1,153 @@
+"""Test compiled template rendering."""
+import time
+
+import pytest
+from bs4 import BeautifulSoup
+
+from info_sur.rendering import ARTICLE_FIELDS, TAG_PREFIX, compile_template
+
+TEMPLATE = (
+    '<html><body>'
+    '<h1 class="mod_titulo">Viejo</h1>'
+    '<p>Por <span class="mod_autores">X</span></p>'
+    '<img class="mod_pie1" src="default.jpg" alt="por defecto"/>'
+    '<p class="mod_cuerpo1">texto <b>viejo</b></p>'
+    '<ul><li><a class="mod_tema1">t1</a></li><li><a class="mod_tema2">t2</a></li></ul>'
+    + '<p>relleno</p>' * 500 +
+    '</body></html>'
+)
+
+
+# An AMP article page with the quirks templates have in practice: images with
+# and without src/alt, repeated and nested classes, and more than 9 tema tags.
+REALISTIC_TEMPLATE = (
+    '<!doctype html><html amp lang="es"><head><meta charset="utf-8">'
+    '<title>Info Sur</title><style amp-custom>body{font-family:serif}</style></head><body>'
+    '<header><a href="/">Info Sur &amp; Cía</a></header><article>'
+    '<h1 class="mod_titulo titular">Titular de ejemplo</h1><h2 class="mod_subtitulo"></h2>'
+    '<p class="firma">Por <span class="mod_autores">Redacción</span> · '
+    '<span class="mod_ciudad">Málaga</span> · <time class="mod_fecha"></time></p>'
+    '<figure><img class="mod_pie1" src="/images/placeholder.jpg" srcset="/images/placeholder@2x.jpg 2x" alt="Imagen">'
+    '<figcaption class="mod_pie1">Pie por defecto</figcaption></figure>'
+    '<p class="mod_cuerpo1">Primer <em>párrafo</em></p><p class="mod_cuerpo2"></p>'
+    '<aside><h3>Relacionada</h3><p class="mod_relacionada"></p></aside>'
+    '<figure><img class="mod_pie2"><figcaption class="mod_pie2"></figcaption></figure>'
+    '<p class="mod_cuerpo3"></p><p class="mod_cuerpo4"></p>'
+    '<blockquote class="mod_catchline">«Cita»</blockquote>'
+    '<p class="mod_cuerpo5"></p><p class="mod_cuerpo6"></p><p class="mod_cuerpo7"></p>'
+    '<img class="mod_pie2 miniatura" alt="Miniatura" srcset="/m.jpg 1x" width="80">'
+    '</article><footer><ul class="temas">'
+    + ''.join(f'<li><a class="mod_tema{i}" href="/tema/{i}">Tema {i}</a></li>' for i in range(1, 13)) +
+    '</ul><span class="mod_tema2 destacado">Tema destacado</span></footer></body></html>'
+)
+
+FULL_ARTICLE = {
+    'mod_titulo': 'Málaga <estrena> "metro" & más',
+    'mod_subtitulo': '  Con espacios  ',
+    'mod_autores': ['Ana', 'Luis'],
+    'mod_ciudad': 'Sevilla',
+    'mod_fecha': '1 de enero',
+    'mod_pie1': 'Pie "uno"',
+    'mod_cuerpo1': 'Cuerpo 1',
+    'mod_pie2': '',
+    'mod_catchline': None,
+    'mod_cuerpo7': 7,
+}
+
+
+def legacy_render(template_html, article_data, image_data):
+    """The BeautifulSoup renderer CompiledTemplate replaced, kept as the reference."""
+    soup = BeautifulSoup(template_html, "lxml")
+    modules = article_data.copy()
+    temas = modules.get("temas", [])
+    for field in ARTICLE_FIELDS:
+        value = modules.get(field, "")
+        text_value = "" if value is None else str(value)
+        for tag in soup.select(f".{field}"):
+            if tag.name == "img":
+                if field == "mod_pie1" and image_data.get("primary"):
+                    tag["src"] = image_data["primary"]
+                    tag["alt"] = text_value or tag.get("alt", "")
+                elif field == "mod_pie2" and image_data.get("secondary"):
+                    tag["src"] = image_data["secondary"]
+                    tag["alt"] = text_value or tag.get("alt", "")
+                continue
+            tag.clear()
+            if text_value:
+                tag.append(text_value)
+    for tag in soup.select(".mod_autores"):
+        autores = modules.get("mod_autores")
+        if isinstance(autores, list):
+            autores = " y ".join(autores)
+        if autores:
+            tag.clear()
+            tag.append(autores)
+    for idx, tema in enumerate(temas, start=1):
+        for tag in soup.select(f".{TAG_PREFIX}{idx}"):
+            tag.clear()
+            tag.append(tema)
+    for idx in range(len(temas) + 1, 10):
+        for tag in soup.select(f".{TAG_PREFIX}{idx}"):
+            tag.decompose()
+    return soup.prettify(formatter="html")
+
+
+@pytest.mark.parametrize('article_data, image_data', [
+    ({}, {}),
+    (FULL_ARTICLE, {}),
+    ({**FULL_ARTICLE, 'temas': ['Feria', ' Playa ', '']}, {'primary': 'https://x.test/a.jpg?a=1&b=2'}),
+    ({**FULL_ARTICLE, 'temas': [f'Tema {i}' for i in range(1, 12)]}, {'secondary': 'https://x.test/b.jpg'}),
+    ({'temas': [f'T{i}' for i in range(1, 16)], 'mod_pie2': 'Segunda'},
+     {'primary': 'https://x.test/a.jpg', 'secondary': 'https://x.test/b.jpg'}),
+])
+def test_render_matches_legacy_renderer(article_data, image_data):
+    """Test that compiled rendering gives the same HTML as the BeautifulSoup renderer."""
+    html = compile_template(REALISTIC_TEMPLATE).render(article_data, image_data)
+    assert html == legacy_render(REALISTIC_TEMPLATE, article_data, image_data)
+
+
+def test_render_fills_text_fields_and_escapes():
+    """Test that module fields are replaced and HTML-escaped."""
+    html = compile_template(TEMPLATE).render({
+        'mod_titulo': 'Málaga <b>& más</b>',
+        'mod_autores': ['Ana', 'Luis'],
+    })
+    assert 'M&aacute;laga &lt;b&gt;&amp; m&aacute;s&lt;/b&gt;' in html
+    assert 'Ana y Luis' in html
+    assert 'Viejo' not in html
+    assert 'viejo' not in html
+
+
+def test_render_temas_removes_unused_tags():
+    """Test that temas fill their tags and extra tema tags are dropped."""
+    html = compile_template(TEMPLATE).render({'temas': ['Feria']})
+    assert 'Feria' in html
+    assert 'mod_tema1' in html
+    assert 'mod_tema2' not in html
+
+
+def test_render_images_only_with_url():
+    """Test that image src/alt change only when an URL is provided."""
+    compiled = compile_template(TEMPLATE)
+    html = compiled.render({'mod_pie1': 'Pie'})
+    assert 'src="default.jpg"' in html
+    assert 'alt="por defecto"' in html
+
+    html = compiled.render({'mod_pie1': 'Pie'}, {'primary': 'https://x.test/a.jpg?a=1&b=2'})
+    assert 'src="https://x.test/a.jpg?a=1&amp;b=2"' in html
+    assert 'alt="Pie"' in html
+
+
+def test_compile_template_is_cached():
+    """Test that compiled templates are reused for identical HTML."""
+    assert compile_template(TEMPLATE) is compile_template(str(TEMPLATE))
+
+
+def test_render_latency():
+    """Test that rendering a cached template stays in single-digit milliseconds."""
+    compiled = compile_template(TEMPLATE)
+    runs = 100
+    started = time.perf_counter()
+    for _ in range(runs):
+        compiled.render({'mod_titulo': 'Titular', 'temas': ['a', 'b']})
+    assert (time.perf_counter() - started) / runs < 0.005
@@ -0,0 +1,241 @@
+"""Test NDJSON export and import of the article corpus."""
+import gzip
+import json
+import os
+import threading
+import time
+
+import pytest
+from sqlalchemy import func, select
+
+from info_sur.database import get_session
+from info_sur import transfer
+from info_sur.models import Article
+from info_sur.services import get_article_by_slug
+from info_sur.transfer import import_ndjson, iter_export_chunks, iter_export_lines
+
+# Opt-in: INFOSUR_BENCH_ARTICLES=100000 pytest -m benchmark
+BENCH_ARTICLES = int(os.environ.get("INFOSUR_BENCH_ARTICLES", "0"))
+BENCH_MIN_RATE = float(os.environ.get("INFOSUR_BENCH_MIN_RATE", "1000"))
+
+
+def make_article_line(index, title=None):
+    """Build a single NDJSON article record."""
+    timestamp = f"2024{index:010d}"
+    return json.dumps({
+        "type": "article",
+        "slug": f"noticia-{index}-{timestamp}",
+        "timestamp": timestamp,
+        "prompt": f"Prompt {index}",
+        "satire_level": 50,
+        "article_data": {"mod_titulo": title or f"Noticia {index}", "temas": ["Málaga"]},
+        "image_data": {"primary": None},
+        "created_at": "2024-01-01T12:00:00",
+        "updated_at": "2024-01-01T12:00:00",
+    })
+
+
+def count_articles():
+    with get_session() as session:
+        return session.scalar(select(func.count()).select_from(Article))
+
+
+def test_import_then_export_roundtrip(app):
+    """Test that exported lines can be imported back unchanged."""
+    stats = import_ndjson([make_article_line(i) for i in range(5)])
+    assert stats["inserted"] == 5
+
+    lines = [json.loads(line) for line in iter_export_lines(include_templates=False)]
+    assert [line["slug"] for line in lines] == [f"noticia-{i}-2024{i:010d}" for i in range(5)]
+    assert lines[0]["article_data"]["temas"] == ["Málaga"]
+    assert lines[0]["created_at"] == "2024-01-01T12:00:00"
+
+
+def test_import_conflict_skip_and_update(app):
+    """Test that existing slugs are skipped or updated."""
+    import_ndjson([make_article_line(1)])
+
+    stats = import_ndjson([make_article_line(1, title="Cambiado")])
+    assert stats == {"inserted": 0, "updated": 0, "skipped": 1, "templates": 0}
+
+    stats = import_ndjson([make_article_line(1, title="Cambiado")], on_conflict="update")
+    assert stats["updated"] == 1
+    assert count_articles() == 1
+    with get_session() as session:
+        article = session.scalars(select(Article)).one()
+        assert article.article_data["mod_titulo"] == "Cambiado"
+
+
+def test_import_mixed_optional_columns(app):
+    """Test that records with and without optional columns share a batch."""
+    bare = json.loads(make_article_line(2))
+    for column in ("satire_level", "created_at", "updated_at"):
+        del bare[column]
+    stats = import_ndjson([make_article_line(1), json.dumps(bare)], on_conflict="update")
+    assert stats["inserted"] == 2
+    stats = import_ndjson([make_article_line(1, title="A"), json.dumps(bare)], on_conflict="update")
+    assert stats["updated"] == 2
+    assert count_articles() == 2
+
+
+def test_concurrent_imports_of_same_slug(app, monkeypatch):
+    """Test that racing imports insert a slug once and the page still loads."""
+    barrier = threading.Barrier(2, timeout=10)
+    lookup = transfer.archived_slugs
+
+    def archived_slugs_in_lockstep(slugs):
+        # Both imports have checked for conflicts before either inserts
+        found = lookup(slugs)
+        barrier.wait()
+        return found
+
+    monkeypatch.setattr(transfer, "archived_slugs", archived_slugs_in_lockstep)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(import_ndjson([make_article_line(1)])))
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(stats["inserted"] for stats in results) == [0, 1]
+    assert count_articles() == 1
+    assert get_article_by_slug(f"noticia-1-2024{1:010d}") is not None
+
+
+def test_import_rejects_invalid_lines(app):
+    """Test that malformed records raise a ValueError."""
+    with pytest.raises(ValueError):
+        import_ndjson(["{not json"])
+    with pytest.raises(ValueError):
+        import_ndjson([json.dumps({"type": "article"})])
+    with pytest.raises(ValueError):
+        import_ndjson([], on_conflict="replace")
+
+
+@pytest.mark.parametrize("record", [
+    {"type": "article", "slug": "sin-timestamp"},
+    {"type": "article", "slug": "a", "timestamp": "20240101120000", "prompt": "p"},
+    {"type": "article", "slug": "a", "timestamp": "20240101120000", "prompt": "p", "article_data": "abc"},
+    {"type": "article", "slug": "a", "timestamp": "20240101120000", "prompt": "p",
+     "article_data": {}, "created_at": "ayer"},
+    {"type": "article", "slug": "a", "timestamp": "2" * 15, "prompt": "p", "article_data": {}},
+    {"type": "article", "slug": "a" * 256, "timestamp": "20240101120000", "prompt": "p", "article_data": {}},
+    {"type": "article", "slug": "a", "timestamp": "20240101120000", "prompt": "p",
+     "article_data": {}, "satire_level": 2**31},
+    {"type": "article", "slug": "a", "timestamp": "20240101120000", "prompt": "p",
+     "article_data": {"mod_titulo": "a\x00b"}},
+    {"type": "article", "slug": "a", "timestamp": "20240101120000", "prompt": "p",
+     "article_data": {}, "image_prompt_primary": {"texto": "x"}},
+    {"type": "template_revision"},
+    ["no", "es", "un", "objeto"],
+    "texto",
+])
+def test_import_rejects_incomplete_records(app, record):
+    """Test that records the database would refuse fail validation, not on insert."""
+    with pytest.raises(ValueError, match="Línea 2"):
+        import_ndjson([make_article_line(1), json.dumps(record)])
+
+
+def test_import_template_revisions_once(app):
+    """Test that template revisions are imported without duplicates."""
+    line = json.dumps({
+        "type": "template_revision",
+        "template_html": "<html></html>",
+        "created_at": "2024-01-01T12:00:00",
+    })
+    assert import_ndjson([line])["templates"] == 1
+    assert import_ndjson([line])["templates"] == 0
+
+
+def test_api_export_gzip(client):
+    """Test streaming a gzip export through the API."""
+    import_ndjson([make_article_line(i) for i in range(3)])
+    response = client.get('/api/export?gzip=1&templates=0')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/gzip'
+    lines = gzip.decompress(response.data).decode('utf-8').splitlines()
+    assert len(lines) == 3
+
+
+def test_api_import(client):
+    """Test importing NDJSON through the API."""
+    body = "\n".join(make_article_line(i) for i in range(3))
+    response = client.post('/api/import', data=body, content_type='application/x-ndjson')
+    assert response.status_code == 200
+    assert response.get_json()["inserted"] == 3
+
+    response = client.post(
+        '/api/import',
+        data=gzip.compress(body.encode('utf-8')),
+        content_type='application/gzip',
+        query_string={'on_conflict': 'update'},
+    )
+    assert response.get_json()["updated"] == 3
+
+
+def test_api_import_incomplete_record(client):
+    """Test that an incomplete record is a client error."""
+    body = json.dumps({"type": "article", "slug": "sin-campos"})
+    response = client.post('/api/import', data=body, content_type='application/x-ndjson')
+    assert response.status_code == 400
+    assert 'timestamp' in response.get_data(as_text=True)
+
+
+def test_api_import_out_of_range_record(client):
+    """Test that values beyond the column limits are a client error on every backend."""
+    record = json.loads(make_article_line(1))
+    record["timestamp"] = "2" * 15
+    response = client.post('/api/import', data=json.dumps(record), content_type='application/x-ndjson')
+    assert response.status_code == 400
+    assert 'timestamp' in response.get_data(as_text=True)
+
+
+def test_cli_import_incomplete_record(runner, tmp_path):
+    """Test that the CLI reports invalid records without a traceback."""
+    source = tmp_path / 'articles.ndjson'
+    source.write_text(json.dumps({"type": "article", "slug": "sin-campos"}) + "\n", encoding='utf-8')
+    result = runner.invoke(args=['import-articles', str(source)])
+    assert result.exit_code == 1
+    assert 'Línea 1' in result.output
+
+
+def test_api_import_invalid_conflict_mode(client):
+    """Test that an unknown conflict mode is rejected."""
+    response = client.post('/api/import?on_conflict=replace', data='')
+    assert response.status_code == 400
+
+
+def test_cli_export_import(runner, tmp_path):
+    """Test the export-articles and import-articles CLI commands."""
+    import_ndjson([make_article_line(i) for i in range(4)])
+    target = tmp_path / 'articles.ndjson.gz'
+    result = runner.invoke(args=['export-articles', '-o', str(target), '--no-templates'])
+    assert result.exit_code == 0
+    assert len(gzip.decompress(target.read_bytes()).splitlines()) == 4
+
+    result = runner.invoke(args=['import-articles', str(target)])
+    assert result.exit_code == 0
+    assert 'omitidos 4' in result.output
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(not BENCH_ARTICLES, reason="set INFOSUR_BENCH_ARTICLES to run")
+def test_export_import_throughput(app, record_property):
+    """Measure export and import throughput on a large corpus."""
+    started = time.perf_counter()
+    stats = import_ndjson(make_article_line(i) for i in range(BENCH_ARTICLES))
+    import_rate = BENCH_ARTICLES / (time.perf_counter() - started)
+    assert stats["inserted"] == BENCH_ARTICLES
+
+    started = time.perf_counter()
+    exported = sum(chunk.count(b"\n") for chunk in iter_export_chunks(include_templates=False))
+    export_rate = BENCH_ARTICLES / (time.perf_counter() - started)
+    assert exported == BENCH_ARTICLES
+
+    record_property("import_articles_per_second", round(import_rate))
+    record_property("export_articles_per_second", round(export_rate))
+    assert import_rate >= BENCH_MIN_RATE
+    assert export_rate >= BENCH_MIN_RATE